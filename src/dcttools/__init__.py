@@ -7,11 +7,14 @@ from .core import (
     depth,
     flaggregate,
     kfltr,
+    kfltr_rep,
     kfrep,
     kswap,
     maggregate,
+    maggregate_cached,
     naggregate,
     to_dataframe,
+    to_records,
 )
 
 __version__ = version(__name__)
@@ -17,22 +17,33 @@ functionalities.
    depth
    kfltr
    kfrep
+   kfltr_rep
    kswap
    flaggregate
    naggregate
    maggregate
+   maggregate_cached
+   to_records
    to_dataframe
 """
 
+# All core utilities are kept in this one module (see the note above), most
+# of its lines being the numpy style docstrings and their doctests:
+# pylint: disable=too-many-lines
+
 import logging
-import math
-from collections import defaultdict, deque
-from itertools import zip_longest
+from collections import OrderedDict
+from itertools import chain
 
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+#: Number of results kept by :func:`maggregate_cached`
+MAGGREGATE_CACHE_SIZE = 128
+
+_maggregate_cache = OrderedDict()
+
 
 def depth(dct):
     """Find out a dictionairy's depth.
@@ -58,6 +69,8 @@ def depth(dct):
     ------
     TypeError
         Raised when :paramref:`depth.dct` is ot of instance dict.
+    ValueError
+        Raised when :paramref:`depth.dct` contains itself.
 
     Examples
     --------
@@ -77,19 +90,34 @@ def depth(dct):
     if not isinstance(dct, dict):
         raise TypeError(f"'{dct}' of type '{type(dct)}' not 'dict'")
 
-    queue = deque([(id(dct), dct, 1)])
-    memo = set()
-    while queue:
-        id_, obj, level = queue.popleft()
-        if id_ in memo:
-            continue
-        memo.add(id_)
-        if isinstance(obj, dict):
-            queue += ((id(v), v, level + 1) for v in obj.values())
-    return level - 1
-
-
-def kfltr(dcts=(), fltr="", xcptns=(), **kwargs):
+    # (common) flat dicts do not need any traversal:
+    if not dct:
+        return 0
+    if not any(isinstance(value, dict) for value in dct.values()):
+        return 1
+
+    # Level order traversal: each level holds the distinct non empty sub
+    # dicts of the level above. Shared sub dicts reappear on every level
+    # they are reachable at, so the level count is the longest nesting.
+    level = 0
+    seen = set()
+    frontier = {id(dct): dct}
+    while frontier:
+        level += 1
+        seen.update(frontier)
+        if level > len(seen):
+            # nesting can not be deeper than the number of distinct dicts
+            raise ValueError(f"'{dct}' contains itself and has no depth")
+        frontier = {
+            id(value): value
+            for obj in frontier.values()
+            for value in obj.values()
+            if isinstance(value, dict) and value
+        }
+    return level
+
+
+def kfltr(dcts=(), fltr="", xcptns=(), prefix_only=False, **kwargs):
     r"""Key Filter out any unwanted entries.
 
     Return a new dictionairy containing only items with keys containing
@@ -102,14 +130,21 @@ def kfltr(dcts=(), fltr="", xcptns=(), **kwargs):
         Container of Dictionaires of which the keys are to be filtered
         (dcts = dictionairies)
 
-    fltr: str, default=''
-        String that is searched for in the dictionairy keys
+    fltr: str, tuple, default=''
+        String that is searched for in the dictionairy keys. Leaving it
+        default keeps every key. Using
+        :paramref:`~kfltr.prefix_only` a tuple of prefices is accepted as well.
         (fltr = abbrevation for filter)
 
-    xcptns: :class:`~collections.abc.Container`, default=()
-        Container of strings not to be frepped. Aka keys to be ignored.
+    xcptns: str, :class:`~collections.abc.Iterable`, default=()
+        Iterable of keys to be kept regardless of
+        :paramref:`~kfltr.fltr`. A single string is treated as one key.
         (xcptns = abbrevation for exceptions)
 
+    prefix_only: bool, default=False
+        Only keep keys starting with :paramref:`~kfltr.fltr`. By default
+        keys containing :paramref:`~kfltr.fltr` anywhere are kept.
+
     kwargs
         Key words . Of course you can always just
         add the kwargs to be frepped to the dcts iterable.
@@ -145,49 +180,73 @@ def kfltr(dcts=(), fltr="", xcptns=(), **kwargs):
      'tweak_txt': "See 'case'",
      'x': 10}
 
+    Only keep keys starting with one of several prefices:
+
+    >>> print(*kfltr(dcts=[{'a_1': 1, 'b_2': 2, 'c_a_3': 3}],
+    ...              fltr=('a_', 'b_'), prefix_only=True))
+    {'a_1': 1, 'b_2': 2}
+
     """
     # Create and empty list which is to be filled with the filtered dicts
     filtered = []
+    # Check the log level once, instead of on every debug call:
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    # convert exceptions once for constant time membership tests:
+    xcptns = _as_frozenset(xcptns)
+
+    if prefix_only:
+        # str.startswith checks a tuple of prefices in one call:
+        fltr = (fltr,) if isinstance(fltr, str) else tuple(fltr)
 
     # iterate through all dictionairies. Do not include kwargs if none
     # stated otherwise there will be an empty kwarg at the end of filtered
     # which leads to unexpected unpacking errors
-    for dctnry in [*dcts, kwargs] if kwargs else dcts:
-
-        # Start logging the filter process:
-        logger.debug(50 * "-")
-        # State code location for easier debugging:
-        logger.debug(
-            "Filtering a dict inside %s.kfltr with %s keys",
-            __name__,
-            len(dctnry.keys()),
-        )
-        # Explicitly log the filtering parmeters:
-        logger.debug('Filter for "%s" (exceptions: %s)\n', fltr, xcptns)
-
-        # create a temporary dict for storing the filtered entries.
-        tmp_dct = {}
-
-        # iterate through every item of the current dict:
-        for key, value in dctnry.items():
+    for dctnry in chain(dcts, (kwargs,) if kwargs else ()):
+
+        if prefix_only:
+            tmp_dct = {
+                key: value
+                for key, value in dctnry.items()
+                if key.startswith(fltr) or key in xcptns
+            }
+        elif fltr:
             # look for fltr word in the key but respect the exceptions
-            if fltr in key or key in xcptns:
-                # update the temporary dict if filter hits
-                tmp_dct.update({key: value})
-
-                # Explicitly log the filtered key for prove of concept
+            tmp_dct = {
+                key: value
+                for key, value in dctnry.items()
+                if fltr in key or key in xcptns
+            }
+        else:
+            # an empty fltr is found in every key, so just copy the dict
+            tmp_dct = dict(dctnry)
+
+        if debug:
+            # Start logging the filter process:
+            logger.debug(50 * "-")
+            # State code location for easier debugging:
+            logger.debug(
+                "Filtering a dict inside %s.kfltr with %s keys",
+                __name__,
+                len(dctnry.keys()),
+            )
+            # Explicitly log the filtering parmeters:
+            logger.debug('Filter for "%s" (exceptions: %s)\n', fltr, xcptns)
+
+            # Explicitly log the filtered keys for prove of concept
+            for key in tmp_dct:
                 logger.debug("Filtered %s", key)
 
+            # Log the end of kflts with a dashed line and a linebreak
+            logger.debug("%s", 50 * "-" + "\n")  # use lazy evaluation
+
         # Add the filtered dict to output iterable of dicts:
         filtered.append(tmp_dct)
 
-        # Log the end of kflts with a dashed line and a linebreak
-        logger.debug("%s", 50 * "-" + "\n")  # use lazy evaluation
-
     return filtered
 
 
-def kfrep(dcts=(), fnd="", rplc="", xcptns=(), **kwargs):
+def kfrep(dcts=(), fnd="", rplc="", xcptns=(), prefix_only=False, **kwargs):
     r"""Key Find and Replace dictionairy entries.
 
     Find :paramref:`~kfrep.fnd` in dictionairy keys and replace them with
@@ -201,7 +260,8 @@ def kfrep(dcts=(), fnd="", rplc="", xcptns=(), **kwargs):
         (dcts = abbrevation for dictionairies)
 
     fnd: str, default=''
-        String that is searched for in the dictionairy keys
+        String that is searched for in the dictionairy keys. Leaving it
+        default does not replace anything.
         (fnd = abbrevation for find)
 
     rplc: str, default=''
@@ -209,10 +269,15 @@ def kfrep(dcts=(), fnd="", rplc="", xcptns=(), **kwargs):
         (Leaving it default just removes the found string)
         (rplc = abbrevation for replace)
 
-    xcptns: :class:`~collections.abc.Iterable`, default=()
+    xcptns: str, :class:`~collections.abc.Iterable`, default=()
         Iterable of strings not to be frepped. Aka keys to be ignored.
+        A single string is treated as one key.
         (xcptns = abbrevation for exceptions)
 
+    prefix_only: bool, default=False
+        Only replace :paramref:`~kfrep.fnd` if it is a key's prefix. By
+        default every occurrence of :paramref:`~kfrep.fnd` is replaced.
+
     kwargs
         Key words to be frepped. Of course you can always just
         add the kwargs to be frepped to the :paramref:`~kfrep.dcts` container.
@@ -221,7 +286,8 @@ def kfrep(dcts=(), fnd="", rplc="", xcptns=(), **kwargs):
     -------
     list
         List of dicts and kwargs that have been frepped. Original dicts
-        are not altered!
+        are not altered! Key order is kept. If a frepped key collides with
+        another key of the same dict, the one coming last takes precedence.
 
     Examples
     --------
@@ -250,7 +316,7 @@ def kfrep(dcts=(), fnd="", rplc="", xcptns=(), **kwargs):
     >>> print(dct, dflts)
     {'txt': 'hi', 's': 5, 'kwarg': 1} {'mst_hve': 'yes', 'first_kwarg': 0}
     >>> print(kwargs)
-    {'first_kwarg': 2, 'second_txt': 'hi there', 'second_mst_hve': 'no'}
+    {'second_txt': 'hi there', 'second_mst_hve': 'no', 'first_kwarg': 2}
 
 
     Chaining filter and find and replace utility to only get kwargs previously
@@ -263,51 +329,230 @@ def kfrep(dcts=(), fnd="", rplc="", xcptns=(), **kwargs):
     >>> print(*kfrep(dcts=kfltr(dcts=[kwargs], fltr='tweak_'),
     ...              fnd='tweak_'))
     {'case': {'cat1': '1', 'cat2': '2', 'cat3': 1}, 'txt': "See 'case'"}
+
+    Only replace prefices, leaving other occurrences as they are:
+
+    >>> print(*kfrep(dcts=[{'tweak_tweak_case': 1, 'case_tweak_': 2}],
+    ...              fnd='tweak_', prefix_only=True))
+    {'tweak_case': 1, 'case_tweak_': 2}
+
+    Or fusing both steps into one pass using :func:`kfltr_rep`:
+
+    >>> print(*kfltr_rep(dcts=[kwargs], fltr='tweak_', fnd='tweak_'))
+    {'case': {'cat1': '1', 'cat2': '2', 'cat3': 1}, 'txt': "See 'case'"}
     """
     # Create an empty iterable which is to be filled with the frepped dicts:
     frepped = []
+    # Check the log level once, instead of on every debug call:
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    # convert exceptions once for constant time membership tests:
+    xcptns = _as_frozenset(xcptns)
+    # length of a prefix to be replaced:
+    cut = len(fnd)
+
     # iterate through all dictionairies.
     # Do not include empty kwargs in the process otherwise an empty dict will
     # be appended to frepped
-    for dctnry in [*dcts, kwargs] if kwargs else dcts:
+    for dctnry in chain(dcts, (kwargs,) if kwargs else ()):
+
+        if not fnd:
+            # an empty fnd has nothing to replace
+            # (str.replace would insert rplc between every character)
+            frepped_keys = list(dctnry)
+        elif prefix_only:
+            # replace fnd only if it is the prefix of a non exception key:
+            frepped_keys = [
+                rplc + key[cut:] if key.startswith(fnd) and key not in xcptns else key
+                for key in dctnry
+            ]
+        else:
+            # find and replace fnd in all keys not listed as exceptions:
+            frepped_keys = [
+                key if key in xcptns else key.replace(fnd, rplc) for key in dctnry
+            ]
+
+        # rebuild the dict in one pass (original dicts are not altered):
+        frepped_dct = dict(zip(frepped_keys, dctnry.values()))
+
+        if debug:
+            # Start logging the frepping process:
+            logger.debug(50 * "-")
+            # State code location for easier debugging:
+            logger.debug(
+                "Frepping a dict inside %s.kfrep with %s keys",
+                __name__,
+                len(dctnry.keys()),
+            )
+            # Explicitly log the filtering parmeters:
+            logger.debug('Find "%s", replace: "%s" ', fnd, rplc)
+            logger.debug("(exceptions: %s)\n", xcptns)
+
+            # Explicitly log the frepped keys for prove of concept
+            for key, frepped_key in zip(dctnry, frepped_keys):
+                if key != frepped_key:
+                    logger.debug('Frepped "%s" with "%s"', key, frepped_key)
+
+            # Log the end of kfrep with a dashed line and a linebreak
+            logger.debug("%s", 50 * "-" + "\n")  # use lazy evaluation
 
-        dctnry = dctnry.copy()
-        # Start logging the frepping process:
-        logger.debug(50 * "-")
-        # State code location for easier debugging:
-        logger.debug(
-            "Frepping a dict inside %s.kfrep with %s keys",
-            __name__,
-            len(dctnry.keys()),
+        # Add the found and replaced dict to output iterable of dicts:
+        frepped.append(frepped_dct)
+
+    return frepped
+
+
+# kfltr_rep fuses the arguments of kfltr and kfrep:
+# pylint: disable-next=too-many-arguments
+def kfltr_rep(
+    dcts=(), fltr="", fnd="", rplc="", xcptns=(), *, prefix_only=False, **kwargs
+):
+    r"""Key Filter and Replace dictionairy entries in one pass.
+
+    Does the same as chaining :func:`kfltr` and :func:`kfrep`::
+
+        kfrep(dcts=kfltr(dcts, fltr, xcptns, prefix_only),
+              fnd, rplc, xcptns, prefix_only)
+
+    without creating the intermediate filtered dicts.
+    (kfltr_rep = abbrevation of key filter replace)
+
+    Parameters
+    ----------
+    dcts: :class:`~collections.abc.Container`, default=()
+        Container of Dictionaires of which the keys are to be filtered and
+        frepped. (dcts = dictionairies)
+
+    fltr: str, tuple, default=''
+        String that is searched for in the dictionairy keys. Leaving it
+        default keeps every key. Using
+        :paramref:`~kfltr_rep.prefix_only` a tuple of prefices is accepted as
+        well.
+        (fltr = abbrevation for filter)
+
+    fnd: str, default=''
+        String that is searched for in the filtered dictionairy keys. Leaving
+        it default does not replace anything.
+        (fnd = abbrevation for find)
+
+    rplc: str, default=''
+        String that the found string is replaced with.
+        (Leaving it default just removes the found string)
+        (rplc = abbrevation for replace)
+
+    xcptns: str, :class:`~collections.abc.Iterable`, default=()
+        Iterable of keys to be kept regardless of :paramref:`~kfltr_rep.fltr`
+        and not to be frepped. A single string is treated as one key.
+        (xcptns = abbrevation for exceptions)
+
+    prefix_only: bool, default=False
+        Only keep keys starting with :paramref:`~kfltr_rep.fltr` and only
+        replace :paramref:`~kfltr_rep.fnd` if it is a key's prefix. By
+        default keys containing :paramref:`~kfltr_rep.fltr` anywhere are kept
+        and every occurrence of :paramref:`~kfltr_rep.fnd` is replaced.
+        (keyword only)
+
+    kwargs
+        Key words to be filtered and frepped. Of course you can always just
+        add the kwargs to the :paramref:`~kfltr_rep.dcts` container.
+
+    Returns
+    -------
+    list
+        List of dicts and kwargs that have been filtered and frepped.
+        Original dicts are not altered!
+
+    Examples
+    --------
+    Only get kwargs containing a ``tweak_`` prefix, deleting this prefix, so
+    the kwargs are ready to be passed to a third party API:
+
+    >>> kwargs = {'t': {'cat1': 1, 'cat2': 2, 'cat3': 3},
+    ...           'tweak_case': {'cat1': '1', 'cat2': '2', 'cat3': 1},
+    ...           'tweak_txt': "See \'case\'"}
+    >>> print(*kfltr_rep(dcts=[kwargs], fltr='tweak_', fnd='tweak_'))
+    {'case': {'cat1': '1', 'cat2': '2', 'cat3': 1}, 'txt': "See 'case'"}
+    """
+    if not fnd:
+        # nothing to replace, so just filter
+        # (str.replace would insert rplc between every character)
+        return kfltr(
+            dcts=dcts, fltr=fltr, xcptns=xcptns, prefix_only=prefix_only, **kwargs
         )
-        # Explicitly log the filtering parmeters:
-        logger.debug('Find "%s", replace: "%s" ', fnd, rplc)
-        logger.debug("(exceptions: %s)\n", xcptns)
-
-        # iterating through all keys in dict:
-        # USE COPY OF A DICT HERE SINCE THE DICT IS CHANGED DURING ITERATION
-        for key in dctnry.copy().keys():
-            # is key to be filtered ?
-            if fnd in key and key not in xcptns:
-                # ... yes, so create a temp copy of original key:
-                original_key = key
-                # ... filter out the filter string:
-                key = key.replace(fnd, rplc)
-                # create a new entry with new key and delete the old one:
-                dctnry[key] = dctnry.pop(original_key)
-
-                # Explicitly log the frepped key for prove of concept
-                logger.debug('Frepped "%s" with "%s"', original_key, key)
 
-        # Add the found and replaced dict to output iterable of dicts:
-        frepped.append(dctnry)
+    # Create an empty iterable which is to be filled with the frepped dicts:
+    frepped = []
+    # Check the log level once, instead of on every debug call:
+    debug = logger.isEnabledFor(logging.DEBUG)
 
-        # Log the end of kfrep with a dashed line and a linebreak
-        logger.debug("%s", 50 * "-" + "\n")  # use lazy evaluation
+    # convert exceptions once for constant time membership tests:
+    xcptns = _as_frozenset(xcptns)
+    # length of a prefix to be replaced:
+    cut = len(fnd)
+
+    if prefix_only:
+        # str.startswith checks a tuple of prefices in one call:
+        fltr = (fltr,) if isinstance(fltr, str) else tuple(fltr)
+
+    # iterate through all dictionairies.
+    # Do not include empty kwargs in the process otherwise an empty dict will
+    # be appended to frepped
+    for dctnry in chain(dcts, (kwargs,) if kwargs else ()):
+
+        # filter and rebuild the dict in one pass, replacing fnd in all keys
+        # not listed as exceptions:
+        if prefix_only:
+            # (looking for prefices only)
+            frepped_dct = {
+                (
+                    rplc + key[cut:]
+                    if key.startswith(fnd) and key not in xcptns
+                    else key
+                ): value
+                for key, value in dctnry.items()
+                if key.startswith(fltr) or key in xcptns
+            }
+        else:
+            frepped_dct = {
+                (key if key in xcptns else key.replace(fnd, rplc)): value
+                for key, value in dctnry.items()
+                if fltr in key or key in xcptns
+            }
+
+        if debug:
+            # Start logging the filter and frepping process:
+            logger.debug(50 * "-")
+            # State code location for easier debugging:
+            logger.debug(
+                "Filtering and frepping a dict inside %s.kfltr_rep with %s keys",
+                __name__,
+                len(dctnry.keys()),
+            )
+            # Explicitly log the filtering and frepping parmeters:
+            logger.debug('Filter for "%s", find "%s", ', fltr, fnd)
+            logger.debug('replace: "%s" (exceptions: %s)\n', rplc, xcptns)
+
+            # Explicitly log the resulting keys for prove of concept
+            for key in frepped_dct:
+                logger.debug("Kept %s", key)
+
+            # Log the end of kfltr_rep with a dashed line and a linebreak
+            logger.debug("%s", 50 * "-" + "\n")  # use lazy evaluation
+
+        # Add the filtered and frepped dict to output iterable of dicts:
+        frepped.append(frepped_dct)
 
     return frepped
 
 
+def _as_frozenset(xcptns):
+    """Convert exceptions to a frozenset, treating a string as one key."""
+    if isinstance(xcptns, str):
+        return frozenset((xcptns,))
+    # (frozensets are returned as they are, without copying)
+    return frozenset(xcptns)
+
+
 def kswap(nstd_dct):
     r"""Key Swap, top and sublevel keys of a nested dict.
 
@@ -337,27 +582,40 @@ def kswap(nstd_dct):
      'cat2': {'tweak_case': '2'},
      'cat3': {'tweak_case': 1}}
     """
-    # Start logging the filter process:
-    logger.debug(50 * "-")
-    # State code location for easier debugging:
-    logger.debug(
-        "Swapping keys inside %s.kswap with %s keys",
-        __name__,
-        len(nstd_dct.keys()),
-    )
+    # Nothing to swap for empty and flat dicts (stops at the first sub dict):
+    if not any(isinstance(subdct, dict) for subdct in nstd_dct.values()):
+        return {}
+
+    # Check the log level once, instead of on every debug call:
+    debug = logger.isEnabledFor(logging.DEBUG)
 
-    key_swapped = defaultdict(dict)
-    for tlkey in nstd_dct.keys():
-        if isinstance(nstd_dct[tlkey], dict):
-            for subkey, value in nstd_dct[tlkey].items():
-                key_swapped[subkey].update({tlkey: value})
+    if debug:
+        # Start logging the filter process:
+        logger.debug(50 * "-")
+        # State code location for easier debugging:
+        logger.debug(
+            "Swapping keys inside %s.kswap with %s keys",
+            __name__,
+            len(nstd_dct.keys()),
+        )
 
-                logger.debug('Swapped "%s" with "%s"', tlkey, subkey)
+    key_swapped = {}
+    # bind the method once, instead of looking it up for every entry:
+    setdefault = key_swapped.setdefault
+    for tlkey, subdct in nstd_dct.items():
+        # (non-nested entries have no sublevel keys to swap)
+        if isinstance(subdct, dict):
+            for subkey, value in subdct.items():
+                setdefault(subkey, {})[tlkey] = value
+
+                if debug:
+                    logger.debug('Swapped "%s" with "%s"', tlkey, subkey)
 
     # Log the end of kswap with a dashed line and a linebreak
-    logger.debug("%s", 50 * "-" + "\n")
+    if debug:
+        logger.debug("%s", 50 * "-" + "\n")
 
-    return dict(key_swapped)
+    return key_swapped
 
 
 def flaggregate(dcts=(), **kwargs):
@@ -376,8 +634,8 @@ def flaggregate(dcts=(), **kwargs):
 
     Parameters
     ----------
-    dcts: :class:`~collections.abc.Container`, default=()
-        Container of dictionaires which are to be aggregated. The order in
+    dcts: :class:`~collections.abc.Iterable`, default=()
+        Iterable of dictionaires which are to be aggregated. The order in
         which they are provided is crucial. The dict coming last will
         potentially override every other dict. (dcts = dictionairies)
 
@@ -434,24 +692,36 @@ def flaggregate(dcts=(), **kwargs):
     # Create an empty iterable to aggregate the dict items into
     aggregated = {}
 
-    # Aggregate dcts and kwargs into one list if kwargs were uitlized:
-    if kwargs:
-        dctnrs = [*dcts, kwargs]
-    else:
-        dctnrs = dcts
+    # Check the log level once, instead of on every debug call:
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    if debug:
+        # (only lazily provided dicts need to be materialized for counting)
+        dcts = tuple(dcts)
+        # Start logging the filter process:
+        logger.debug(50 * "-")
+        # State code location for easier debugging:
+        logger.debug(
+            "Aggregating %s dicts inside %s.flaggregate\n",
+            len(dcts) + (1 if kwargs else 0),
+            __name__,
+        )
 
-    # Start logging the filter process:
-    logger.debug(50 * "-")
-    # State code location for easier debugging:
-    logger.debug("Aggregating %s dicts inside %s.flaggregate\n", len(dctnrs), __name__)
+    # Chain dcts and kwargs if kwargs were uitlized (without copying dcts):
+    dctnrs = chain(dcts, (kwargs,) if kwargs else ())
 
     # iterate through all dictionairies.
     for dctnry in dctnrs:
+        # Without logging overrides, dict.update does the job
+        # note this will potentially overwrite previous entries
+        # (which is the desired behaviour)
+        if not debug:
+            aggregated.update(dctnry)
+            continue
+
         # get the key-value pair of the current  dict:
         for key, value in dctnry.items():
-            # update the key-value pair
-            # note this will potentially overwrite previous entries
-            # (which is the desired behaviour)
+            # update the key-value pair logging the overridden ones
             if key in aggregated:
                 logger.debug('Value "%s" for key "%s" ', aggregated[key], key)
                 logger.debug('is overridden by "%s"', value)
@@ -459,7 +729,8 @@ def flaggregate(dcts=(), **kwargs):
             aggregated[key] = value
 
     # Log the end of kfrep with a dashed line and a linebreak
-    logger.debug("%s", 50 * "-" + "\n")  # lazy logging evaluation
+    if debug:
+        logger.debug("%s", 50 * "-" + "\n")  # lazy logging evaluation
 
     return aggregated
 
@@ -472,8 +743,8 @@ def naggregate(nstd_dcts=()):
 
     Parameters
     ----------
-    nstd_dcts: :class:`~collections.abc.Container`, default=()
-        Container of nested dictionaires which are to be aggregated. The order
+    nstd_dcts: :class:`~collections.abc.Iterable`, default=()
+        Iterable of nested dictionaires which are to be aggregated. The order
         in which they are provided is crucial. The dict coming last will
         potentially override every other.
         (nstd_dcts= abbrevation for nested dictionairies)
@@ -509,42 +780,56 @@ def naggregate(nstd_dcts=()):
      'n3': {'s': 3},
      'n4': {'s': 4}}
     """
-    # Start logging the aggregation process:
-    logger.debug(50 * "-")
-    # State code location for easier debugging:
-    logger.debug(
-        "Aggregating %s nested dicts inside %s.naggregate\n", len(nstd_dcts), __name__
-    )
+    # Check the log level once, instead of on every debug call:
+    debug = logger.isEnabledFor(logging.DEBUG)
 
-    # Use a temporary default dict to simplify aggregating algorithm
-    # (Preventing KeyErrors, when adding new top level key entries)
-    aggregated = defaultdict(dict)
+    if debug:
+        # (only lazily provided dicts need to be materialized for counting)
+        nstd_dcts = tuple(nstd_dcts)
+        # Start logging the aggregation process:
+        logger.debug(50 * "-")
+        # State code location for easier debugging:
+        logger.debug(
+            "Aggregating %s nested dicts inside %s.naggregate\n",
+            len(nstd_dcts),
+            __name__,
+        )
+
+    # Create an empty dict to aggregate the nested dict items into
+    aggregated = {}
 
     # iterate though all dictionairies in nstd_dicts:
     for dctnry in nstd_dcts:
-        # iterate through all top level keys of the respective dict:
-        for tlky in dctnry:
+        # iterate through all top level entries of the respective dict:
+        for tlky, subdct in dctnry.items():
+            # empty sub dicts do not add a top level entry:
+            if not subdct:
+                continue
+
+            # look up (or add) the top level entry only once per sub dict:
+            aggregated_subdct = aggregated.setdefault(tlky, {})
+
+            # Without logging overrides, dict.update does the job
+            if not debug:
+                aggregated_subdct.update(subdct)
+                continue
+
             # get the key-value pair of the current sublevel dict:
-            for key, value in dctnry[tlky].items():
-                # store this key-value pair under its top level key:
-                # note this will potentially overwrite previous entries
-                # (which is the desired behaviour)
-                if tlky in aggregated:
-                    if key in aggregated[tlky]:
-                        logger.debug(
-                            'Value "%s" for key "%s" ', aggregated[tlky][key], key
-                        )
-                        logger.debug('is overridden by "%s"', value)
-
-                aggregated[tlky][key] = value
+            for key, value in subdct.items():
+                # store this key-value pair under its top level key logging
+                # the overridden ones
+                if key in aggregated_subdct:
+                    logger.debug(
+                        'Value "%s" for key "%s" ', aggregated_subdct[key], key
+                    )
+                    logger.debug('is overridden by "%s"', value)
                 logger.debug('Filled ["%s"]["%s"] with "%s"', tlky, key, value)
 
-    # turn the default dict into an ordinary dict to allow for broader
-    # applications (the user can retransform anytime anyways)
-    aggregated = dict(aggregated)
+                aggregated_subdct[key] = value
 
     # Log the end of kfrep with a dashed line and a linebreak
-    logger.debug("%s", 50 * "-" + "\n")
+    if debug:
+        logger.debug("%s", 50 * "-" + "\n")
 
     return aggregated
 
@@ -583,16 +868,16 @@ def maggregate(tlkys=(), dcts=(), nstd_dcts=(), **kwargs):
         Iterable of keys the algorithm should be applied to
         (tlkys = abbrevation of top level keys)
 
-    dcts: :class:`~collections.abc.Container`, default=()
-        Container of (prefilled) dictionairies of default kwargs as in::
+    dcts: :class:`~collections.abc.Iterable`, default=()
+        Iterable of (prefilled) dictionairies of default kwargs as in::
 
             [{key1: value1, keyN: valueN, ...}, ...]
 
         Will be overriden by :paramref:`~maggregate.nstd_dct`.
         (dcts = abbrevation of dictionaires)
 
-    nstd_dcts: :class:`~collections.abc.Container`, default=()
-        Container of (prefilled) nested dictionairies to be aggregated as
+    nstd_dcts: :class:`~collections.abc.Iterable`, default=()
+        Iterable of (prefilled) nested dictionairies to be aggregated as
         in::
 
             [{tlky1: {key1: value1}, tlky2: {key2: value2}, ...}, ...]
@@ -692,9 +977,9 @@ def maggregate(tlkys=(), dcts=(), nstd_dcts=(), **kwargs):
     ...           'tweak_txt': "See \'case\'"}
 
     Filter only the kwargs needed in this call and replace the prefix to
-    match the api required keywords:
+    match the api required keywords (in one pass):
 
-    >>> kwargs, = kfrep(dcts=kfltr(dcts=[kwargs], fltr='tweak_'), fnd='tweak_')
+    >>> kwargs, = kfltr_rep(dcts=[kwargs], fltr='tweak_', fnd='tweak_')
 
     Aggregate everything into a nested dict as the api expects, using your own
     defaults and alterations:
@@ -705,102 +990,281 @@ def maggregate(tlkys=(), dcts=(), nstd_dcts=(), **kwargs):
      'cat2': {'case': '2', 's': 7, 'txt': "See 'case'"},
      'cat3': {'case': 1, 's': 0, 'txt': "See 'case'"}}
     """
-    # Start logging the aggregation process:
-    logger.debug(50 * "-")
-    # State code location for easier debugging:
-    logger.debug("Aggregating %s dict, %s nested dict ", len(dcts), len(nstd_dcts))
-    logger.debug("and %s kwargs ", len(kwargs))
-    logger.debug("in %s.maggregate\n", __name__)
+    # Check the log level once, instead of on every debug call:
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    if debug:
+        # (only lazily provided dicts need to be materialized for counting)
+        dcts, nstd_dcts = tuple(dcts), tuple(nstd_dcts)
+        # Start logging the aggregation process:
+        logger.debug(50 * "-")
+        # State code location for easier debugging:
+        logger.debug(
+            "Aggregating %s dict, %s nested dict ",
+            len(dcts),
+            len(nstd_dcts),
+        )
+        logger.debug("and %s kwargs ", len(kwargs))
+        logger.debug("in %s.maggregate\n", __name__)
 
-    # Use a temporary default dict to simplify aggregating algorithm
-    # (Preventing KeyErrors, when adding new top level key entries)
-    aggregated = defaultdict(dict)
+    # Create an empty dict to aggregate the nested dict items into
+    aggregated = {}
 
     # Aggregate non nested  dictionairies for decluttering the algorithm
     aggregates = flaggregate(dcts=dcts)
 
-    # make nested_aggregates a defaultdict(dict) to automatically
-    # add an empty dict during attempted. Prevents KeyErrors.
-    # Note: this will not lead to falsy returned empty dicts, cause
-    # theese dicts will be accessed for kwargs, via dict.get
-    nested_aggregates = defaultdict(dict)
     # Aggregate nested dictionaires for decluttering aggregating algorithm
-    nested_aggregates.update(naggregate(nstd_dcts=nstd_dcts))
-
-    logger.debug("Finished pre aggragation, starting with maggregate")
+    nested_aggregates = naggregate(nstd_dcts=nstd_dcts)
+
+    # kwargs not present in the flat aggregates only need to be looked up
+    # once, instead of for every top level key:
+    kwargs_only = [kwarg for kwarg in kwargs if kwarg not in aggregates]
+
+    # Tell nested (dict valued) kwargs from flat ones, once instead of for
+    # every top level key:
+    nested_kwargs = {
+        kwarg: value for kwarg, value in kwargs.items() if isinstance(value, dict)
+    }
+    flat_kwargs = {
+        kwarg: value for kwarg, value in kwargs.items() if kwarg not in nested_kwargs
+    }
+
+    if debug:
+        logger.debug("Finished pre aggragation, starting with maggregate")
     # Iterrate through every top level key, to have an entry for each:
     for tlky in tlkys:
-        # iterate through every keyword argument...
-        for kwarg in {**aggregates, **nested_aggregates[tlky], **kwargs}:
-
-            # create a temporary source str for logging:
-            src = ""
-            # Accessing differs depending on current kwarg beeing a dict or not
-            if isinstance(kwargs.get(kwarg), dict):
-                # kwarg is a dict ENTRY (aka kwargs[kwarg] is a dict), so ...
-
-                # ... if kwarg has an entry it takes precedence ...
-                if tlky in kwargs[kwarg]:
-                    aggregated[tlky][kwarg] = kwargs[kwarg][tlky]
-                    src = "kwargs"
-
-                # ...if not, nstd entry remains if present...
-                elif kwarg in nested_aggregates[tlky]:
-                    aggregated[tlky][kwarg] = nested_aggregates[tlky][kwarg]
-                    src = "nested dicts"
-
-                # ... no it is not present, so fall back on dct
-                elif kwarg in aggregates:
-                    aggregated[tlky][kwarg] = aggregates[kwarg]
-                    src = "flat dicts"
-
-                # dct didnt help either so fill value with None...
-                else:
-                    aggregated[tlky][kwarg] = None
-                    src = "no source"
-
-            else:
-                # kwargs[kwarg] is NOT a dict, so ...
-
-                # ... if kwarg has an entry it takes precedence ...
-                if kwarg in kwargs:
-                    aggregated[tlky][kwarg] = kwargs[kwarg]
-                    src = "kwargs"
-
-                # ...if not, nstd entry remains if present...
-                elif kwarg in nested_aggregates[tlky]:
-                    aggregated[tlky][kwarg] = nested_aggregates[tlky][kwarg]
-                    src = "nested dicts"
-
-                # ... no it is not present, so fall back on dct
-                else:  # elif kwarg in aggregates:
-                    aggregated[tlky][kwarg] = aggregates[kwarg]
-                    src = "flat dicts"
-
-                # # dct didnt help either so fill value with None...
-                # not working, since kwarg is not iterated over if not
-                # present in kwargs, defaults or nstd_dict[tlkey]
-                # else:
-                #     aggregated[tlky][kwarg] = None
-                #     src = "no source"
-
-                logger.debug(
-                    'Filled ["%s"]["%s"] with "%s" from "%s"',
-                    tlky,
-                    kwarg,
-                    aggregated[tlky][kwarg],
-                    src,
-                )
-
-    # turn the default dict into an ordinary dict to allow for broader
-    # applications (the user can retransform anytime anyways)
-    aggregated = dict(aggregated)
-
-    logger.debug("%s", 50 * "-" + "\n")
+        # (top level keys missing in the nested dicts have no entries)
+        filled, sources = _fill(
+            tlky,
+            aggregates,
+            nested_aggregates.get(tlky, {}),
+            (kwargs_only, flat_kwargs, nested_kwargs),
+        )
+
+        if filled:
+            aggregated[tlky] = filled
+
+        if debug:
+            _log_filled(tlky, filled, sources)
+
+    if debug:
+        logger.debug("%s", 50 * "-" + "\n")
 
     return aggregated
 
 
+def _fill(tlky, aggregates, nested, kwargs_parts):
+    """Fill the parameters of tlky, returning them along with their sources."""
+    kwargs_only, flat_kwargs, nested_kwargs = kwargs_parts
+
+    # Sources of tlky's parameters as in (source label, source dict),
+    # each one overriding the ones before (while keeping the key order
+    # of appearance in aggregates, nested aggregates and kwargs):
+    sources = (
+        ("flat dicts", aggregates),
+        ("nested dicts", nested),
+        # nested kwargs lacking an entry for tlky (and any other source)
+        # are filled with None:
+        (
+            "no source",
+            {kwarg: None for kwarg in kwargs_only if kwarg not in nested},
+        ),
+        ("kwargs", flat_kwargs),
+        (
+            "kwargs",
+            {
+                kwarg: value[tlky]
+                for kwarg, value in nested_kwargs.items()
+                if tlky in value
+            },
+        ),
+    )
+
+    # merge the sources in order of precedence using dict.update:
+    filled = {}
+    for _, source in sources:
+        filled.update(source)
+
+    return filled, sources
+
+
+def _log_filled(tlky, filled, sources):
+    """Log the parameters filled for tlky along with their sources."""
+    # (later sources override the earlier ones, as when filling)
+    labels = {}
+    for label, source in sources:
+        labels.update(dict.fromkeys(source, label))
+
+    for kwarg, value in filled.items():
+        logger.debug(
+            'Filled ["%s"]["%s"] with "%s" from "%s"',
+            tlky,
+            kwarg,
+            value,
+            labels[kwarg],
+        )
+
+
+def maggregate_cached(tlkys=(), dcts=(), nstd_dcts=(), **kwargs):
+    r"""Mixed Aggregate, memoizing results of repeated calls.
+
+    Does the same as :func:`maggregate`, but keeps the results of the
+    :attr:`MAGGREGATE_CACHE_SIZE` most recently used argument combinations.
+    Use it in place of :func:`maggregate` when the same parameters are
+    aggregated over and over again.
+
+    Arguments are compared by value and type, so ``s=1`` and ``s=True`` are
+    cached separately. Calls using mutable values (like lists, sets or dicts
+    nested deeper than :func:`maggregate` expects) fall back on
+    :func:`maggregate` without caching.
+
+    Parameters
+    ----------
+    tlkys: :class:`~collections.abc.Iterable`, default=()
+        See :paramref:`maggregate.tlkys`
+
+    dcts: :class:`~collections.abc.Iterable`, default=()
+        See :paramref:`maggregate.dcts`
+
+    nstd_dcts: :class:`~collections.abc.Iterable`, default=()
+        See :paramref:`maggregate.nstd_dcts`
+
+    kwargs
+        See :paramref:`maggregate.kwargs`
+
+    Returns
+    -------
+    dict
+        A new nested dict as returned by :func:`maggregate`. Altering it
+        does not alter the cached result.
+
+    Examples
+    --------
+    >>> import pprint
+    >>> parameters = {'cat1': {'txt': 'hi', 's': 5},
+    ...               'cat2': {'txt': 'hey', 's': 7}}
+    >>> tlkys = ['cat1', 'cat2', 'cat3']
+    >>> kwargs = {'s': {'cat1': 1, 'cat2': 2, 'cat3': 3}}
+    >>> pprint.pprint(
+    ...    maggregate_cached(tlkys=tlkys, nstd_dcts=[parameters,], **kwargs))
+    {'cat1': {'s': 1, 'txt': 'hi'},
+     'cat2': {'s': 2, 'txt': 'hey'},
+     'cat3': {'s': 3}}
+    """
+    # materialize the arguments, so iterators can be frozen and used again:
+    tlkys, dcts, nstd_dcts = tuple(tlkys), tuple(dcts), tuple(nstd_dcts)
+
+    try:
+        key = (
+            tuple(_freeze(tlky) for tlky in tlkys),
+            tuple(_freeze_items(dct) for dct in dcts),
+            tuple(_freeze_items(nstd_dct, nested=True) for nstd_dct in nstd_dcts),
+            _freeze_items(kwargs, nested=True),
+        )
+        hash(key)
+    except TypeError:
+        logger.debug("Mutable arguments, maggregate_cached is not caching")
+        return maggregate(tlkys=tlkys, dcts=dcts, nstd_dcts=nstd_dcts, **kwargs)
+
+    if key in _maggregate_cache:
+        _maggregate_cache.move_to_end(key)
+    else:
+        _maggregate_cache[key] = maggregate(
+            tlkys=tlkys, dcts=dcts, nstd_dcts=nstd_dcts, **kwargs
+        )
+        # discard the least recently used result:
+        if len(_maggregate_cache) > MAGGREGATE_CACHE_SIZE:
+            _maggregate_cache.popitem(last=False)
+
+    # copy the nested dicts, so the cached result can not be altered:
+    return {tlky: dict(params) for tlky, params in _maggregate_cache[key].items()}
+
+
+def _freeze(obj):
+    """Tag a hashable value (and the items of tuples) with its type."""
+    if isinstance(obj, (tuple, frozenset)):
+        return (type(obj), type(obj)(_freeze(item) for item in obj))
+    # mutable values (lists, dicts, sets, ...) raise a TypeError:
+    hash(obj)
+    return (type(obj), obj)
+
+
+def _freeze_items(dct, nested=False):
+    """Freeze a dict's items (and the items of its sub dicts if nested)."""
+    return (
+        dict,
+        tuple(
+            (
+                _freeze(key),
+                _freeze_items(value)
+                if nested and isinstance(value, dict)
+                else _freeze(value),
+            )
+            for key, value in dct.items()
+        ),
+    )
+
+
+def to_records(mapping, columns, fillvalue=None):
+    r"""Convert a mapping to table rows controlling the number of columns.
+
+    Row wise equivalent of :func:`to_dataframe` not involving pandas. Handy
+    for collecting the rows of many mappings before creating a single
+    :class:`pandas.DataFrame` out of them.
+
+    Parameters
+    ----------
+    mapping: :class:`~collections.abc.Mapping`
+        Mapping to be converted into table rows.
+
+    columns: int
+        Number of key-value column pairs of each row.
+        (i.e. columns=2 results in rows of 4 entries, 2 representing the
+        keys, the other 2 representing the values)
+
+    fillvalue: str, None, default=None
+        If number of key-value pairs inside the mapping is not an integer
+        multiple of :paramref:`~to_records.columns` the modulus amount
+        of entries is filled using :paramref:`~to_records.fillvalue`.
+
+    Returns
+    -------
+    list
+        List of tuples, each holding
+        2 * :paramref:`~to_records.columns` entries.
+
+    Examples
+    --------
+    >>> mapping = {'a': 1, 'b': 2, 'c': 3}
+    >>> to_records(mapping, columns=2)
+    [('a', 1, 'c', 3), ('b', 2, None, None)]
+    """
+    # Nothing to tabulate:
+    if not mapping:
+        return []
+
+    size = len(mapping)
+    # (integer ceiling division, avoiding the float round trip)
+    length = -(-size // columns)
+
+    # pad keys and values, so they can be sliced into columns of equal length
+    # (two C level list builds beat one items() pass creating a tuple per
+    # entry)
+    padding = [fillvalue] * (columns * length - size)
+    keys = list(mapping.keys()) + padding
+    values = list(mapping.values()) + padding
+
+    # slice keys and values column pair wise into the table columns ...
+    table_columns = [
+        entries[start : start + length]
+        for start in range(0, columns * length, length)
+        for entries in (keys, values)
+    ]
+
+    # ... and transpose them into rows:
+    return list(zip(*table_columns))
+
+
 def to_dataframe(mapping, columns, fillvalue=None, index=None):
     r"""Convert a mapping to a table controlling the number of columns.
 
@@ -819,7 +1283,7 @@ def to_dataframe(mapping, columns, fillvalue=None, index=None):
         multiple of :paramref:`~to_dataframe.columns` the modulus amount
         of entries is filled using :paramref:`~to_dataframe.fillvalue`.
 
-        (See also :func:`~itertools.zip_longest`)
+        (See also :func:`to_records`, which provides the padded rows)
 
     index: :class:`pandas.Index`, default=None
         Index used for createing the table.
@@ -866,24 +1330,6 @@ def to_dataframe(mapping, columns, fillvalue=None, index=None):
     i0     flow_costs     0  installed_capacity   0.0  accumulated_max  None
     i1  co2_emissions     0     accumulated_min   NaN             None  None
     """
-    length = math.ceil(len(mapping.keys()) / columns)
-
-    args = [iter(mapping.keys())] * length
-    keys = list(zip(*zip_longest(*args, fillvalue=fillvalue)))
-    args = [iter(mapping.values())] * length
-    values = list(zip(*zip_longest(*args, fillvalue=fillvalue)))
-
-    table = pd.concat(
-        [
-            pd.DataFrame(keys, index=index),
-            pd.DataFrame(values, index=index),
-        ],
-        axis="columns",
-    )
-
-    # resort the table columns
-    table = table[list(range(columns))]
+    rows = to_records(mapping, columns, fillvalue)
 
-    # relabel the table columns
-    table.columns = columns * ["key", "value"]  # rename column pair lables
-    return table
+    return pd.DataFrame(rows, columns=columns * ["key", "value"], index=index)
@@ -1,7 +1,10 @@
 # tests/test_api.py
 """Test core API."""
 # standard library
+import logging
 import math
+import sys
+from collections import OrderedDict
 
 # third-party packages
 import pandas as pd
@@ -19,6 +22,9 @@ import dcttools
         ({1: 1}, 1),
         ({1: 1, 2: 1}, 1),
         ({1: {1: 2}}, 2),
+        ({1: {}}, 1),
+        ({1: {1: {1: 3}}, 2: 1}, 3),
+        ({1: 1, 2: {1: {1: 3}}}, 3),
     ],
 )
 def test_depth(dct, expected_result):
@@ -26,6 +32,29 @@ def test_depth(dct, expected_result):
     assert dcttools.depth(dct) == expected_result
 
 
+def test_depth_shared():
+    """Test dcttools.depth on dicts sharing the same sub dict."""
+    shared = {1: {1: 3}}
+    assert dcttools.depth({1: shared, 2: {1: shared}}) == 4
+
+
+def test_depth_very_deep():
+    """Test dcttools.depth on very deeply nested dicts."""
+    levels = sys.getrecursionlimit() + 10
+    dct = {1: 1}
+    for _ in range(levels - 1):
+        dct = {1: dct, 2: {}}
+    assert dcttools.depth(dct) == levels
+
+
+def test_depth_cyclic():
+    """Test dcttools.depth on dicts containing themselves."""
+    dct = {1: 1}
+    dct[2] = {1: dct}
+    with pytest.raises(ValueError):
+        dcttools.depth(dct)
+
+
 def test_depth_exception():
     """Test the correct dcttools.depth functionality on wrong argument type."""
     with pytest.raises(Exception):
@@ -68,6 +97,43 @@ def test_kfltr_kwargs():
     assert flat_results == expected_result
 
 
+def test_kfltr_xcptns_as_str():
+    """Test dcttools.kfltr treating a single string as one exception."""
+    expected_result = {
+        "tweak_case": {"cat1": "1", "cat2": "2", "cat3": 1},
+        "tweak_txt": "See 'case'",
+    }
+
+    # 't' would be found inside of 'tweak_txt', if the string was searched:
+    # pylint: disable=unbalanced-tuple-unpacking
+    (result,) = dcttools.kfltr(dcts=[kfltr_kwargs], fltr="case", xcptns="tweak_txt")
+
+    assert result == expected_result
+
+
+def test_kfltr_empty_fltr():
+    """Test dcttools.kfltr keeping every key when using an empty filter."""
+    # pylint: disable=unbalanced-tuple-unpacking
+    (result,) = dcttools.kfltr(dcts=[kfltr_kwargs])
+
+    assert result == kfltr_kwargs
+    assert result is not kfltr_kwargs
+
+
+def test_kfltr_prefix_only():
+    """Test dcttools.kfltr only keeping keys starting with the filter."""
+    dct = {"tweak_case": 1, "case_tweak_": 2, "tweak_txt": 3, "x": 4}
+
+    # pylint: disable=unbalanced-tuple-unpacking
+    (result,) = dcttools.kfltr(dcts=[dct], fltr="tweak_", prefix_only=True)
+    assert result == {"tweak_case": 1, "tweak_txt": 3}
+
+    (result,) = dcttools.kfltr(
+        dcts=[dct], fltr=("tweak_", "case_"), xcptns="x", prefix_only=True
+    )
+    assert result == dct
+
+
 # -------------- dcttools.kfrep ------------------
 kfrep_dct = {"txt": "hi", "s": 5, "kwarg": 1}
 kfrep_dflts = {"mst_hve": "yes", "first_kwarg": 0}
@@ -120,7 +186,7 @@ def test_kfrep_kwargs_as_kwargs_and_frep():
         fnd="first_",
         rplc="second_",
         xcptns="first_kwarg",
-        **kfrep_kwargs
+        **kfrep_kwargs,
     )
 
     assert [dct, dflts, kwargs] == expected_result
@@ -140,12 +206,59 @@ def test_kfrep_kwargs_as_kwargs_and_frep_not_altering():
         fnd="first_",
         rplc="second_",
         xcptns="first_kwarg",
-        **kfrep_kwargs
+        **kfrep_kwargs,
     )
 
     assert [kfrep_dct, kfrep_dflts, kfrep_kwargs] == expected_result
 
 
+def test_kfrep_xcptns_as_str():
+    """Test dcttools.kfrep treating a single string as one exception."""
+    expected_result = {"first_kwarg": 2, "kw": 3}
+
+    # 'first_kw' would be found inside of 'first_kwarg', if it was searched:
+    # pylint: disable=unbalanced-tuple-unpacking
+    (result,) = dcttools.kfrep(
+        dcts=[{"first_kwarg": 2, "first_kw": 3}], fnd="first_", xcptns="first_kwarg"
+    )
+
+    assert result == expected_result
+
+
+def test_kfrep_prefix_only():
+    """Test dcttools.kfrep only replacing prefices."""
+    expected_result = {"txt": 1, "tweak_case": 2, "case_tweak_": 3, "tweak_": 4}
+
+    # pylint: disable=unbalanced-tuple-unpacking
+    (result,) = dcttools.kfrep(
+        dcts=[{"tweak_txt": 1, "tweak_tweak_case": 2, "case_tweak_": 3, "tweak_": 4}],
+        fnd="tweak_",
+        xcptns="tweak_",
+        prefix_only=True,
+    )
+
+    assert result == expected_result
+
+
+def test_kfrep_empty_fnd():
+    """Test dcttools.kfrep not replacing anything using an empty find str."""
+    # pylint: disable=unbalanced-tuple-unpacking
+    (result,) = dcttools.kfrep(dcts=[kfrep_dct], rplc="second_")
+
+    assert result == kfrep_dct
+    assert result is not kfrep_dct
+
+
+def test_kfrep_colliding_keys():
+    """Test dcttools.kfrep keeping the key coming last on collisions."""
+    # pylint: disable=unbalanced-tuple-unpacking
+    (result,) = dcttools.kfrep(dcts=[{"first_a": 1, "a": 2}], fnd="first_")
+    assert result == {"a": 2}
+
+    (result,) = dcttools.kfrep(dcts=[{"a": 2, "first_a": 1}], fnd="first_")
+    assert result == {"a": 1}
+
+
 def test_kfrep_design_case():
     """Test dcttools.kfrep design case."""
     new_kfrep_kwargs = {
@@ -170,6 +283,72 @@ def test_kfrep_design_case():
     assert third_party_api_kwargs[0] == expected_result
 
 
+# -------------- dcttools.kfltr_rep ------------------
+def test_kfltr_rep_design_case():
+    """Test dcttools.kfltr_rep design case."""
+    expected_result = {
+        "case": {"cat1": "1", "cat2": "2", "cat3": 1},
+        "txt": "See 'case'",
+    }
+
+    # Filtering and frepping in one pass to only get kwargs previously
+    # containing a tweak_ prefix, deleting this prefix.
+    (third_party_api_kwargs,) = dcttools.kfltr_rep(
+        dcts=[kfltr_kwargs], fltr="tweak_", fnd="tweak_"
+    )
+
+    assert third_party_api_kwargs == expected_result
+
+
+@pytest.mark.parametrize("prefix_only", [False, True])
+def test_kfltr_rep_as_chain(prefix_only):
+    """Test dcttools.kfltr_rep doing the same as chaining kfltr and kfrep."""
+    params = {
+        "fltr": "kwarg",
+        "xcptns": ["txt"],
+        "prefix_only": prefix_only,
+        "x_kwarg": 3,
+    }
+    chained = dcttools.kfrep(
+        dcts=dcttools.kfltr(dcts=[kfrep_dct, kfrep_dflts, kfrep_kwargs], **params),
+        fnd="first_",
+        rplc="second_",
+        xcptns=params["xcptns"],
+        prefix_only=prefix_only,
+    )
+    fused = dcttools.kfltr_rep(
+        dcts=[kfrep_dct, kfrep_dflts, kfrep_kwargs],
+        fnd="first_",
+        rplc="second_",
+        **params,
+    )
+
+    assert fused == chained
+
+
+def test_kfltr_rep_empty_fnd():
+    """Test dcttools.kfltr_rep only filtering using an empty find str."""
+    expected_result = dcttools.kfltr(dcts=[kfltr_kwargs], fltr="tweak_")
+
+    result = dcttools.kfltr_rep(dcts=[kfltr_kwargs], fltr="tweak_", rplc="x")
+
+    assert result == expected_result
+
+
+def test_kfltr_rep_prefix_only():
+    """Test dcttools.kfltr_rep only filtering and replacing prefices."""
+    expected_result = {"case": 1, "txt_tweak_": 2}
+
+    (result,) = dcttools.kfltr_rep(
+        dcts=[{"tweak_case": 1, "tweak_txt_tweak_": 2, "x_tweak_a": 3}],
+        fltr="tweak_",
+        fnd="tweak_",
+        prefix_only=True,
+    )
+
+    assert result == expected_result
+
+
 # -------------- dcttools.kswap ------------------
 kswap_nd = {"tweak_case": {"cat1": "1", "cat2": "2", "cat3": 1}}
 
@@ -199,6 +378,18 @@ def test_kswap_on_flat():
     assert not dcttools.kswap({"cat1": "1", "cat2": "2", "cat3": 1})
 
 
+def test_kswap_empty():
+    """Test dcttools.kswap on an empty dict."""
+    assert not dcttools.kswap({})
+
+
+def test_kswap_partly_nested():
+    """Test dcttools.kswap ignoring non-nested entries of nested dicts."""
+    assert dcttools.kswap({"flat": 1, "tweak_case": {"cat1": "1"}}) == {
+        "cat1": {"tweak_case": "1"}
+    }
+
+
 def test_kswap_similar():
     """Test the correct dcttools.kswap functionality on similar nested keys."""
     nested_dct = {
@@ -346,6 +537,16 @@ def test_naggregate_not_altering(dcts, original, expected_result):
     assert original == expected_result
 
 
+def test_naggregate_empty_sub_dicts(caplog):
+    """Test dcttools.naggregate leaving out empty sub dicts (also when logging)."""
+    for level in (logging.WARNING, logging.DEBUG):
+        caplog.set_level(level, logger="dcttools.core")
+
+        result = dcttools.naggregate(nstd_dcts=[{"a": {}, "b": {"x": 1}}])
+
+        assert result == {"b": {"x": 1}}
+
+
 # -------------- dcttools.maggregate ------------------
 magg_params = {"cat1": {"txt": "hi", "s": 5}, "cat2": {"txt": "hey", "s": 7}}
 magg_tlkys = ["cat1", "cat2", "cat3"]
@@ -499,6 +700,102 @@ def test_maggregate_fallback_on_kwargs_not_overriding():
     assert result == expected_result
 
 
+def test_aggregates_empty():
+    """Test dcttools aggregates returning empty dicts on empty input."""
+    assert not dcttools.flaggregate()
+    assert not dcttools.naggregate()
+    assert not dcttools.maggregate(dcts=[magg_params], **magg_kwargs)
+
+
+def test_aggregates_from_pandas():
+    """Test dcttools aggregates using pandas objects as input."""
+    tlkys = pd.Index(["cat1", "cat2"])
+    expected_result = {"cat1": {"s": 0}, "cat2": {"s": 0}}
+
+    assert dcttools.maggregate(tlkys=tlkys, dcts=[{"s": 0}]) == expected_result
+    assert (
+        dcttools.maggregate(tlkys=tlkys.to_numpy(), dcts=pd.Series([{"s": 0}]))
+        == expected_result
+    )
+    assert dcttools.flaggregate(dcts=pd.Series([{"s": 0}, {"s": 1}])) == {"s": 1}
+    assert dcttools.naggregate(nstd_dcts=pd.Series([magg_params])) == magg_params
+
+
+# -------------- dcttools.maggregate_cached ------------------
+def test_maggregate_cached():
+    """Test dcttools.maggregate_cached returning maggregate results."""
+    expected_result = dcttools.maggregate(
+        tlkys=magg_tlkys, nstd_dcts=[magg_params], **magg_kwargs
+    )
+
+    for _ in range(2):
+        result = dcttools.maggregate_cached(
+            tlkys=iter(magg_tlkys), nstd_dcts=[magg_params], **magg_kwargs
+        )
+        assert result == expected_result
+
+
+def test_maggregate_cached_not_altering_cache():
+    """Test dcttools.maggregate_cached results not altering the cache."""
+    result = dcttools.maggregate_cached(tlkys=magg_tlkys, nstd_dcts=[magg_params])
+    expected_result = {tlky: dict(params) for tlky, params in result.items()}
+
+    result["cat1"]["txt"] = "altered"
+    result["new"] = {}
+
+    assert (
+        dcttools.maggregate_cached(tlkys=magg_tlkys, nstd_dcts=[magg_params])
+        == expected_result
+    )
+
+
+def test_maggregate_cached_unhashable():
+    """Test dcttools.maggregate_cached falling back on unhashable kwargs."""
+    expected_result = {"cat1": {"s": {1, 2}}}
+
+    result = dcttools.maggregate_cached(tlkys=["cat1"], s={1, 2})
+
+    assert result == expected_result
+
+
+def test_maggregate_cached_size(monkeypatch):
+    """Test dcttools.maggregate_cached discarding least recently used results."""
+    monkeypatch.setattr(dcttools.core, "MAGGREGATE_CACHE_SIZE", 1)
+    monkeypatch.setattr(dcttools.core, "_maggregate_cache", OrderedDict())
+
+    dcttools.maggregate_cached(tlkys=["cat1"], s=1)
+    dcttools.maggregate_cached(tlkys=["cat1"], s=(1,))
+
+    # pylint: disable-next=protected-access
+    assert len(dcttools.core._maggregate_cache) == 1
+    assert dcttools.maggregate_cached(tlkys=["cat1"], s=1) == {"cat1": {"s": 1}}
+
+
+def test_maggregate_cached_telling_types_apart():
+    """Test dcttools.maggregate_cached telling equal values of other types apart."""
+    for value in (1, True, 1.0, (1,), (True,)):
+        (result,) = dcttools.maggregate_cached(tlkys=["cat1"], s=value).values()
+        # (repr tells 1, True and 1.0 apart, also as tuple items)
+        assert repr(result["s"]) == repr(value)
+
+    for value in (0, False):
+        result = dcttools.maggregate_cached(tlkys=["cat1"], dcts=[{"x": value}])
+        assert type(result["cat1"]["x"]) is type(value)
+
+
+def test_maggregate_cached_list_values():
+    """Test dcttools.maggregate_cached not sharing mutable values."""
+    lst = [1]
+    dcttools.maggregate_cached(tlkys=["cat1"], s=lst)
+    lst.append(2)
+
+    result = dcttools.maggregate_cached(tlkys=["cat1"], s=[1])
+    assert result == {"cat1": {"s": [1]}}
+
+    result["cat1"]["s"].append(2)
+    assert dcttools.maggregate_cached(tlkys=["cat1"], s=[1]) == {"cat1": {"s": [1]}}
+
+
 # -------------- dcttools.to_dataframe ------------------
 to_dataframe_mapping = {
     "flow_costs": 0,
@@ -560,3 +857,110 @@ def test_to_dataframe_fill_values_and_index():
     )
 
     assert result.equals(expected_result)
+
+
+def test_to_dataframe_sequence_values():
+    """Test dcttools.to_dataframe keeping sequence values as they are."""
+    mapping = {"lst": [1, 2], "tpl": (3, 4), "none": None}
+    expected_result = pd.DataFrame(
+        [["lst", [1, 2], "none", None], ["tpl", (3, 4), None, None]],
+        columns=2 * ["key", "value"],
+    )
+
+    result = dcttools.to_dataframe(mapping, columns=2)
+
+    assert result.equals(expected_result)
+
+
+def test_to_dataframe_empty():
+    """Test dcttools.to_dataframe on an empty mapping."""
+    result = dcttools.to_dataframe({}, columns=2)
+
+    assert result.empty
+    assert list(result.columns) == 2 * ["key", "value"]
+
+
+# -------------- dcttools.to_records ------------------
+def test_to_records():
+    """Test dcttools.to_records providing the rows of dcttools.to_dataframe."""
+    expected_result = [
+        ("flow_costs", 0, "accumulated_min", None),
+        ("co2_emissions", 0, "accumulated_max", None),
+        ("installed_capacity", 0, "es", "es"),
+    ]
+
+    result = dcttools.to_records(to_dataframe_mapping, columns=2, fillvalue="es")
+
+    assert result == expected_result
+
+
+# -------------- debug logging ------------------
+def test_debug_logging(caplog):
+    """Test dcttools utilities logging their debug messages."""
+    caplog.set_level(logging.DEBUG, logger="dcttools.core")
+
+    dcttools.kfltr(dcts=[kfltr_kwargs], fltr="tweak_")
+    dcttools.kfrep(dcts=[kfrep_dct, kfrep_dflts, kfrep_kwargs], fnd="first_")
+    dcttools.kfltr_rep(dcts=[kfltr_kwargs], fltr="tweak_", fnd="tweak_")
+    dcttools.kswap(kswap_nd)
+    dcttools.flaggregate([flagg_dct, flagg_dflts], **flagg_kwargs)
+    dcttools.naggregate(nstd_dcts=list_of_naggs)
+    dcttools.maggregate(tlkys=magg_tlkys, nstd_dcts=[magg_params], txt="hi")
+
+    messages = caplog.messages
+    assert "Filtered tweak_case" in messages
+    assert 'Frepped "first_txt" with "txt"' in messages
+    assert "Kept case" in messages
+    assert 'Swapped "tweak_case" with "cat1"' in messages
+    assert 'is overridden by "2"' in messages
+    assert 'Filled ["n4"]["s"] with "4"' in messages
+    assert 'Filled ["cat3"]["txt"] with "hi" from "kwargs"' in messages
+
+
+def test_maggregate_debug_logging_same_result(caplog):
+    """Test dcttools.maggregate filling the same values when logging."""
+    kwargs = {"s": {"cat1": 1}, "case": {"cat2": "2"}, "txt": "ovrrdn"}
+    expected_result = dcttools.maggregate(
+        tlkys=magg_tlkys + ["cat4"],
+        dcts=[{"s": 0, "x": None}],
+        nstd_dcts=[magg_params],
+        **kwargs,
+    )
+
+    caplog.set_level(logging.DEBUG, logger="dcttools.core")
+    result = dcttools.maggregate(
+        tlkys=magg_tlkys + ["cat4"],
+        dcts=[{"s": 0, "x": None}],
+        nstd_dcts=[magg_params],
+        **kwargs,
+    )
+
+    # (compare key order as well)
+    assert [list(dct.items()) for dct in result.values()] == [
+        list(dct.items()) for dct in expected_result.values()
+    ]
+    assert 'Filled ["cat2"]["s"] with "7" from "nested dicts"' in caplog.messages
+    assert 'Filled ["cat3"]["s"] with "0" from "flat dicts"' in caplog.messages
+    assert 'Filled ["cat1"]["case"] with "None" from "no source"' in caplog.messages
+
+
+def test_aggregates_from_generators(caplog):
+    """Test dcttools aggregates consuming generators (also when logging)."""
+    for level in (logging.WARNING, logging.DEBUG):
+        caplog.set_level(level, logger="dcttools.core")
+
+        assert dcttools.flaggregate(
+            dcts=(dct for dct in [flagg_dct, flagg_dflts])
+        ) == dcttools.flaggregate(dcts=[flagg_dct, flagg_dflts])
+
+        assert dcttools.naggregate(
+            nstd_dcts=(dct for dct in list_of_naggs)
+        ) == dcttools.naggregate(nstd_dcts=list_of_naggs)
+
+        assert dcttools.maggregate(
+            tlkys=magg_tlkys,
+            dcts=(dct for dct in [{"s": 0}]),
+            nstd_dcts=(dct for dct in [magg_params]),
+        ) == dcttools.maggregate(
+            tlkys=magg_tlkys, dcts=[{"s": 0}], nstd_dcts=[magg_params]
+        )